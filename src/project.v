@@ -17,6 +17,7 @@ module tt_um_ahmadbelb_TUMVGA(
 );
 
   wire [1:0] mode = ui_in[7:6];
+  wire       burst = ui_in[5];
   wire [4:0] addr = ui_in[4:0];
   
   assign uio_oe = (mode == 2'b10) ? 8'hFF : 8'h00;
@@ -27,6 +28,16 @@ module tt_um_ahmadbelb_TUMVGA(
   reg [2:0] alpha;
   reg [3:0] boundary_temp;
   
+  // Burst access: with ui_in[5] set in write/read mode, the first clock
+  // uses addr and every following clock moves on to the next cell. The
+  // pointer only applies while the burst bit and mode are unchanged, so
+  // dropping ui_in[5] or switching mode addresses ui_in[4:0] straight away.
+  reg [4:0] burst_ptr;
+  reg [1:0] burst_mode;
+  reg burst_active;
+  wire burst_cont = burst & burst_active & (mode == burst_mode);
+  wire [4:0] cell_addr = burst_cont ? burst_ptr : addr;
+  
   // Coordinates
   wire [2:0] cx = (cell_idx < 5)  ? cell_idx[2:0] :
                   (cell_idx < 10) ? (cell_idx - 5) :
@@ -78,8 +89,8 @@ module tt_um_ahmadbelb_TUMVGA(
   wire [3:0] T_final = at_edge ? boundary_temp : T_clamped;
   
   // Outputs
-  assign uo_out = {mode, 2'b0, temp[addr]};
-  assign uio_out = {4'b0, temp[addr]};
+  assign uo_out = {mode, 2'b0, temp[cell_addr]};
+  assign uio_out = {4'b0, temp[cell_addr]};
   
   // Control
   integer i;
@@ -89,6 +100,9 @@ module tt_um_ahmadbelb_TUMVGA(
       cell_idx <= 0;
       alpha <= 3'd2;
       boundary_temp <= 4'd0;
+      burst_ptr <= 0;
+      burst_mode <= 2'b00;
+      burst_active <= 0;
       
       for (i = 0; i < 25; i = i + 1) begin
         temp[i] <= 4'd0;
@@ -103,8 +117,8 @@ module tt_um_ahmadbelb_TUMVGA(
         end
         
         2'b01: begin  // Write
-          if (addr < 25) begin
-            temp[addr] <= uio_in[3:0];
+          if (cell_addr < 25) begin
+            temp[cell_addr] <= uio_in[3:0];
           end
         end
         
@@ -121,9 +135,17 @@ module tt_um_ahmadbelb_TUMVGA(
         end
       endcase
       
+      if (burst && (mode == 2'b01 || mode == 2'b10)) begin
+        burst_active <= 1;
+        burst_mode <= mode;
+        burst_ptr <= cell_addr + 1;
+      end else begin
+        burst_active <= 0;
+      end
+      
     end
   end
   
-  wire _unused = &{ena, ui_in[6:5], uio_in[7:4], sum_neighbors[1:0]};
+  wire _unused = &{ena, uio_in[7:4], sum_neighbors[1:0]};
   
 endmodule
\ No newline at end of file
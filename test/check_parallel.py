@@ -0,0 +1,29 @@
+"""Fail `make parallel` if PARALLEL_TESTS does not match the tests in test.py.
+
+Every per-test run discovers the whole module, so the merged results name
+each test in test.py, including those filtered out or skipped. Compare
+those names against the list the Makefile passes in.
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+
+
+def main(results_file, listed):
+    discovered = {case.get("name") for case in ET.parse(results_file).iter("testcase")}
+    listed = set(listed)
+
+    status = 0
+    missing = sorted(discovered - listed)
+    if missing:
+        print(f"PARALLEL_TESTS is missing: {' '.join(missing)}", file=sys.stderr)
+        status = 1
+    unknown = sorted(listed - discovered)
+    if unknown:
+        print(f"PARALLEL_TESTS lists unknown tests: {' '.join(unknown)}", file=sys.stderr)
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1], sys.argv[2:]))
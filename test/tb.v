@@ -2,8 +2,13 @@
 `timescale 1ns / 1ps
 
 module tb ();
+  // Waveform name can be overridden with +dumpfile=<name> so parallel
+  // runs do not write to the same file.
+  reg [8*64-1:0] dumpfile;
+  
   initial begin
-    $dumpfile("tb.fst");
+    if (!$value$plusargs("dumpfile=%s", dumpfile)) dumpfile = "tb.fst";
+    $dumpfile(dumpfile);
     $dumpvars(0, tb);
     #1;
   end
@@ -18,12 +23,46 @@ module tb ();
       .ena(ena), .clk(clk), .rst_n(rst_n)
   );
   
+  // Clock is generated here rather than from cocotb, so Python is only
+  // woken up on the edges a test actually waits for. 40 ns = 25 MHz.
+  localparam CLK_PERIOD = 40;
+  
   initial clk = 0;
-  always #10 clk = ~clk;
+  always #(CLK_PERIOD / 2) clk = ~clk;
   
-  reg [3:0] readback;
+  // Run-mode handshake: cocotb sets `sweeps`, switches to run mode and
+  // waits on `done`, which pulses once the DUT has stepped sweeps * 25
+  // cells. The DUT advances one cell per clock while ui_in[7:6] == 00. The
+  // count restarts after every pulse, so back-to-back runs each get their
+  // full number of steps even if run mode is never left in between.
+  localparam GRID_CELLS = 25;
+  
+  reg  [7:0]  sweeps;
+  reg  [15:0] run_steps;
+  reg         done;
   
   initial begin
+    sweeps = 0; run_steps = 0; done = 0;
+  end
+  
+  always @(posedge clk) begin
+    if (~rst_n || ui_in[7:6] != 2'b00) begin
+      run_steps <= 0;
+      done <= 0;
+    end else if (run_steps + 1 == sweeps * GRID_CELLS) begin
+      run_steps <= 0;
+      done <= 1;
+    end else begin
+      run_steps <= run_steps + 1;
+      done <= 0;
+    end
+  end
+  
+  reg [3:0] readback;
+  
+  // Standalone debug run (vvp sim.vvp +standalone). Under cocotb the Python
+  // tests drive the inputs, so this block must stay idle.
+  initial if ($test$plusargs("standalone")) begin
     $display("=== 5x5 Heat Solver Debug Test ===");
     
     ena = 1; rst_n = 0; ui_in = 0; uio_in = 0;
@@ -53,7 +92,7 @@ module tb ();
     // Run 3 iterations
     $display("[RUN] Starting 3 iterations...");
     ui_in = {2'b00, 6'd0};
-    #(25 * 20 * 3);
+    #(25 * CLK_PERIOD * 3);
     
     // Read results
     ui_in = {2'b10, 6'd12};